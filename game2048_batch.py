@@ -0,0 +1,133 @@
+"""NumPy-backed simulation of many 2048 boards at once, for headless use.
+
+Boards are ``(N, 4, 4)`` ``uint8`` arrays of log2 tile values (0 = empty), the
+same cell encoding as ``game_2048.Game2048.state``. Directions use the same
+codes as ``game_2048`` (LEFT, RIGHT, UP, DOWN = 0, 1, 2, 3).
+"""
+
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+
+GRID_SIZE = 4
+MAX_EXPONENT = 15
+LEFT, RIGHT, UP, DOWN = 0, 1, 2, 3
+_CELL_SHIFTS = np.arange(0, 4 * GRID_SIZE * GRID_SIZE, 4, dtype=np.uint64)
+
+
+def _oriented(boards: np.ndarray, direction: int) -> np.ndarray:
+    # A view in which the move runs leftwards; writing into it writes into boards.
+    if direction == LEFT:
+        return boards
+    if direction == RIGHT:
+        return boards[:, :, ::-1]
+    if direction == UP:
+        return boards.transpose(0, 2, 1)
+    if direction == DOWN:
+        return boards.transpose(0, 2, 1)[:, :, ::-1]
+    raise IndexError("direction code out of range")
+
+
+def _compact(rows: np.ndarray) -> np.ndarray:
+    order = np.argsort(rows == 0, axis=1, kind="stable")
+    return np.take_along_axis(rows, order, axis=1)
+
+
+def slide_rows_left(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    rows = _compact(rows)
+    gains = np.zeros(len(rows), dtype=np.int64)
+    # Pairs are resolved left to right, so a merged cell's zeroed partner cannot merge again.
+    for col in range(GRID_SIZE - 1):
+        left = rows[:, col]
+        merge = (left == rows[:, col + 1]) & (left != 0) & (left < MAX_EXPONENT)
+        merged_exponents = left.astype(np.int64) + 1
+        gains += np.where(merge, np.left_shift(1, merged_exponents), 0)
+        rows[merge, col] += 1
+        rows[merge, col + 1] = 0
+    return _compact(rows), gains
+
+
+def move_batch(boards: np.ndarray, direction: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    count = len(boards)
+    rows = _oriented(boards, direction).reshape(count * GRID_SIZE, GRID_SIZE)
+    new_rows, row_gains = slide_rows_left(rows)
+    new_boards = np.empty_like(boards)
+    _oriented(new_boards, direction)[...] = new_rows.reshape(count, GRID_SIZE, GRID_SIZE)
+    gains = row_gains.reshape(count, GRID_SIZE).sum(axis=1)
+    moved = (new_boards != boards).any(axis=(1, 2))
+    return new_boards, gains, moved
+
+
+try:
+    # Optional compiled kernel with the same contract; falls back to the NumPy version above.
+    from game2048_numba import move_batch  # noqa: F811
+except ImportError:
+    pass
+
+
+def can_move_batch(boards: np.ndarray) -> np.ndarray:
+    # Equal neighbours only count below MAX_EXPONENT, the same cap slide_rows_left merges under.
+    return (
+        (boards == 0).any(axis=(1, 2))
+        | ((boards[:, :, :-1] == boards[:, :, 1:]) & (boards[:, :, :-1] < MAX_EXPONENT)).any(axis=(1, 2))
+        | ((boards[:, :-1, :] == boards[:, 1:, :]) & (boards[:, :-1, :] < MAX_EXPONENT)).any(axis=(1, 2))
+    )
+
+
+def spawn_batch(boards: np.ndarray, rng: np.random.Generator, mask: Optional[np.ndarray] = None) -> None:
+    # Picks one empty cell per selected board uniformly by taking the argmax of random keys.
+    empty = (boards == 0).reshape(len(boards), GRID_SIZE * GRID_SIZE)
+    if mask is not None:
+        empty &= mask[:, None]
+    keys = np.where(empty, rng.random(empty.shape), -1.0)
+    targets = np.flatnonzero(empty.any(axis=1))
+    cells = keys[targets].argmax(axis=1)
+    values = np.where(rng.random(len(targets)) < 0.1, 2, 1).astype(boards.dtype)
+    boards[targets, cells // GRID_SIZE, cells % GRID_SIZE] = values
+
+
+def to_states(boards: np.ndarray) -> np.ndarray:
+    cells = boards.reshape(len(boards), GRID_SIZE * GRID_SIZE).astype(np.uint64)
+    return np.bitwise_or.reduce(cells << _CELL_SHIFTS, axis=1)
+
+
+def from_states(states: np.ndarray) -> np.ndarray:
+    states = np.asarray(states, dtype=np.uint64)
+    cells = (states[:, None] >> _CELL_SHIFTS) & np.uint64(0xF)
+    return cells.astype(np.uint8).reshape(len(states), GRID_SIZE, GRID_SIZE)
+
+
+class BatchGame2048:
+    def __init__(self, size: int, seed: Optional[int] = None) -> None:
+        self.rng = np.random.default_rng(seed)
+        self.boards = np.zeros((size, GRID_SIZE, GRID_SIZE), dtype=np.uint8)
+        self.scores = np.zeros(size, dtype=np.int64)
+        self.game_over = np.zeros(size, dtype=bool)
+        self.reset()
+
+    def reset(self) -> None:
+        self.boards[...] = 0
+        self.scores[...] = 0
+        self.game_over[...] = False
+        spawn_batch(self.boards, self.rng)
+        spawn_batch(self.boards, self.rng)
+
+    def move(self, directions: Union[int, np.ndarray]) -> np.ndarray:
+        # One direction for every board, or one per board; returns which boards moved.
+        directions = np.broadcast_to(np.asarray(directions), self.scores.shape)
+        if ((directions < LEFT) | (directions > DOWN)).any():
+            raise IndexError("direction code out of range")
+        new_boards = self.boards.copy()
+        gains = np.zeros_like(self.scores)
+        moved = np.zeros_like(self.game_over)
+        for direction in (LEFT, RIGHT, UP, DOWN):
+            selected = (directions == direction) & ~self.game_over
+            if selected.any():
+                new_boards[selected], gains[selected], moved[selected] = move_batch(self.boards[selected], direction)
+
+        self.boards[moved] = new_boards[moved]
+        self.scores[moved] += gains[moved]
+        spawn_batch(self.boards, self.rng, moved)
+        self.game_over |= ~can_move_batch(self.boards)
+        return moved
@@ -0,0 +1,118 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Compiled move core for game_2048.
+
+Works on the same packed bitboard as game_2048.Game2048.state and uses the
+same direction codes (0 LEFT, 1 RIGHT, 2 UP, 3 DOWN). Build it in place with
+``cythonize -i game2048_core.pyx``; game_2048 falls back to its pure-Python
+step/can_move when this module is missing.
+"""
+
+from libc.stdint cimport uint16_t, uint32_t, uint64_t
+
+cdef uint16_t _row_left[65536]
+cdef uint16_t _row_right[65536]
+cdef uint32_t _gain_left[65536]
+cdef uint32_t _gain_right[65536]
+
+
+cdef inline uint16_t _reverse_row(uint16_t row) nogil:
+    return ((row & 0x000F) << 12) | ((row & 0x00F0) << 4) | ((row >> 4) & 0x00F0) | (row >> 12)
+
+
+cdef void _build_tables():
+    cdef int row, c, count, idx, target, exponent
+    cdef int cells[4]
+    cdef uint16_t new_row, reversed_row
+    cdef uint32_t gain
+    for row in range(65536):
+        count = 0
+        for c in range(4):
+            exponent = (row >> (4 * c)) & 0xF
+            if exponent:
+                cells[count] = exponent
+                count += 1
+        new_row = 0
+        gain = 0
+        idx = 0
+        target = 0
+        while idx < count:
+            exponent = cells[idx]
+            # Matches game_2048: a nibble tops out at 15, so that tile can no longer merge.
+            if idx + 1 < count and cells[idx + 1] == exponent and exponent < 0xF:
+                new_row |= (exponent + 1) << (4 * target)
+                gain += 1 << (exponent + 1)
+                idx += 2
+            else:
+                new_row |= exponent << (4 * target)
+                idx += 1
+            target += 1
+        _row_left[row] = new_row
+        _gain_left[row] = gain
+        reversed_row = _reverse_row(row)
+        _row_right[reversed_row] = _reverse_row(new_row)
+        _gain_right[reversed_row] = gain
+
+
+_build_tables()
+
+
+cdef inline uint64_t _transpose(uint64_t state) nogil:
+    cdef uint64_t a = (
+        (state & 0xF0F00F0FF0F00F0FULL)
+        | ((state & 0x0000F0F00000F0F0ULL) << 12)
+        | ((state & 0x0F0F00000F0F0000ULL) >> 12)
+    )
+    return (
+        (a & 0xFF00FF0000FF00FFULL)
+        | ((a & 0x00FF00FF00000000ULL) >> 24)
+        | ((a & 0x00000000FF00FF00ULL) << 24)
+    )
+
+
+cdef inline uint64_t _slide(uint64_t lines, const uint16_t* rows, const uint32_t* gains, uint32_t* score_gain) nogil:
+    cdef uint64_t new_lines = 0
+    cdef uint16_t row
+    cdef int line
+    for line in range(4):
+        row = (lines >> (16 * line)) & 0xFFFF
+        new_lines |= (<uint64_t>rows[row]) << (16 * line)
+        score_gain[0] += gains[row]
+    return new_lines
+
+
+cdef uint64_t move_state(uint64_t state, int direction, uint32_t* score_gain) nogil:
+    if direction == 0:
+        return _slide(state, _row_left, _gain_left, score_gain)
+    if direction == 1:
+        return _slide(state, _row_right, _gain_right, score_gain)
+    if direction == 2:
+        return _transpose(_slide(_transpose(state), _row_left, _gain_left, score_gain))
+    return _transpose(_slide(_transpose(state), _row_right, _gain_right, score_gain))
+
+
+cdef inline uint64_t _nonzero_cells(uint64_t state) nogil:
+    return (state | (state >> 1) | (state >> 2) | (state >> 3)) & 0x1111111111111111ULL
+
+
+cpdef tuple step(uint64_t state, int direction):
+    cdef uint32_t score_gain = 0
+    cdef uint64_t new_state
+    if direction < 0 or direction > 3:
+        raise IndexError("direction code out of range")
+    new_state = move_state(state, direction, &score_gain)
+    return new_state, score_gain, new_state != state
+
+
+cdef inline uint64_t _capped_cells(uint64_t state) nogil:
+    return state & (state >> 1) & (state >> 2) & (state >> 3) & 0x1111111111111111ULL
+
+
+cpdef bint can_move(uint64_t state):
+    cdef uint64_t mergeable
+    if _nonzero_cells(state) != 0x1111111111111111ULL:
+        return True
+    # As in _build_tables, exponent-15 tiles never merge, so equal pairs of them are not a move.
+    mergeable = ~_capped_cells(state)
+    if ~_nonzero_cells(state ^ (state >> 4)) & 0x0111011101110111ULL & mergeable:
+        return True
+    return ~_nonzero_cells(state ^ (state >> 16)) & 0x0000111111111111ULL & mergeable != 0
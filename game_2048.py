@@ -1,14 +1,30 @@
+import atexit
 import json
 import os
 import random
 import sys
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Set, Tuple
+import threading
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 import pygame
 
 
 GRID_SIZE = 4
+# The board is a single int: cell (r, c) holds log2(tile) in bits 4 * (4 * r + c) .. +4, 0 = empty.
+CELL_BITS = 4
+CELL_MASK = 0xF
+ROW_BITS = GRID_SIZE * CELL_BITS
+ROW_MASK = (1 << ROW_BITS) - 1
+WIN_EXPONENT = 11
+# Direction codes, shared with game2048_core.pyx and game2048_batch.py.
+LEFT, RIGHT, UP, DOWN = 0, 1, 2, 3
+NIBBLE_LOW_BITS = 0x1111111111111111
+HORIZONTAL_PAIRS = 0x0111011101110111
+VERTICAL_PAIRS = 0x0000111111111111
+BYTE_LOW_NIBBLES = 0x0F0F0F0F0F0F0F0F
+WIN_CARRY_BIAS = (CELL_MASK + 1 - WIN_EXPONENT) * 0x0101010101010101
+WIN_CARRY_BITS = 0x1010101010101010
 TILE_COLORS = {
     0: (204, 192, 179),
     2: (238, 228, 218),
@@ -23,6 +39,11 @@ TILE_COLORS = {
     1024: (237, 197, 63),
     2048: (237, 194, 46),
 }
+OVERFLOW_TILE_COLOR = (60, 58, 50)
+# Indexed by value.bit_length(): 0 is the empty cell and n is the tile 2 ** (n - 1).
+TILE_COLORS_TABLE = tuple(
+    TILE_COLORS.get(1 << (n - 1) if n else 0, OVERFLOW_TILE_COLOR) for n in range(CELL_MASK + 2)
+)
 BACKGROUND_COLOR = (250, 248, 239)
 BOARD_COLOR = (187, 173, 160)
 TEXT_COLOR = (119, 110, 101)
@@ -35,6 +56,9 @@ BOARD_TOP = 210
 TILE_GAP = 12
 BOARD_SIZE = WINDOW_WIDTH - 2 * BOARD_MARGIN
 TILE_SIZE = (BOARD_SIZE - (GRID_SIZE + 1) * TILE_GAP) // GRID_SIZE
+WINDOW_RECT = pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+HEADER_RECT = pygame.Rect(0, 0, WINDOW_WIDTH, BOARD_TOP)
+BOARD_RECT = pygame.Rect(BOARD_MARGIN, BOARD_TOP, BOARD_SIZE, BOARD_SIZE)
 ANIMATION_DURATION_MS = 140
 SPAWN_ANIMATION_DURATION_MS = 120
 BUTTON_WIDTH = 170
@@ -45,11 +69,23 @@ CONTROL_BUTTON_PADDING_X = 28
 CONTROL_BUTTON_PADDING_Y = 12
 CONTROL_BUTTON_GAP = 18
 CONTROL_BUTTON_ROW_GAP = 10
-HEADER_CONTROL_BUTTONS = [
+HEADER_CONTROL_BUTTONS = (
     ("Restart", "RESTART"),
     ("Quit", "QUIT"),
-]
+)
+HEADER_BUTTON_COLOR = (196, 180, 160)
+OVERLAY_BUTTONS = (("Replay", "replay"), ("Exit", "exit"))
+SCORE_LABELS = ("TOTAL", "BEST")
+QUIT_KEYS = frozenset((pygame.K_ESCAPE, pygame.K_q))
+EXPOSE_EVENTS = frozenset((pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED))
+KEY_TO_DIRECTION = {
+    pygame.K_LEFT: LEFT,
+    pygame.K_RIGHT: RIGHT,
+    pygame.K_UP: UP,
+    pygame.K_DOWN: DOWN,
+}
 SCORE_STATE_FILE = os.path.join(os.path.dirname(__file__), "score_state.json")
+SCORE_SAVE_DELAY_S = 0.25
 
 
 def load_score_state() -> Dict[str, int]:
@@ -67,32 +103,215 @@ def load_score_state() -> Dict[str, int]:
 
 
 def save_score_state(best_score: int, total_score: int) -> None:
+    temp_file = SCORE_STATE_FILE + ".tmp"
     try:
-        with open(SCORE_STATE_FILE, "w", encoding="utf-8") as handler:
+        with open(temp_file, "w", encoding="utf-8") as handler:
             json.dump({"best_score": best_score, "total_score": total_score}, handler)
+        os.replace(temp_file, SCORE_STATE_FILE)
     except OSError:
         pass
 
 
-def reverse(row: List[int]) -> List[int]:
-    return list(reversed(row))
+class ScoreStateWriter:
+    """Saves the score state on a background thread, keeping only the newest pending write."""
+
+    def __init__(self, delay: float = SCORE_SAVE_DELAY_S) -> None:
+        self.delay = delay
+        self._pending: Optional[Tuple[int, int]] = None
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, best_score: int, total_score: int) -> None:
+        with self._condition:
+            self._pending = (best_score, total_score)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="score-state-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+            self._condition.notify()
+
+    def flush(self) -> None:
+        # Taking and writing under one lock keeps an older snapshot from landing after a newer one.
+        with self._write_lock:
+            with self._condition:
+                pending, self._pending = self._pending, None
+            if pending is not None:
+                save_score_state(*pending)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None:
+                    self._condition.wait()
+            time.sleep(self.delay)
+            self.flush()
+
+
+score_writer = ScoreStateWriter()
+
+
+RowMove = Tuple[int, int, Tuple[Tuple[int, int, bool], ...]]
+
+
+def _build_row_move_left(row: int) -> RowMove:
+    exponents = [(row >> (CELL_BITS * c)) & CELL_MASK for c in range(GRID_SIZE)]
+    non_zero = [(exponent, c) for c, exponent in enumerate(exponents) if exponent != 0]
+    new_row = 0
+    gain = 0
+    moves: List[Tuple[int, int, bool]] = []
+    target = 0
+    idx = 0
+
+    while idx < len(non_zero):
+        exponent, col = non_zero[idx]
+        # A nibble tops out at 15, so the largest tile can no longer merge.
+        if idx + 1 < len(non_zero) and non_zero[idx + 1][0] == exponent and exponent < CELL_MASK:
+            next_col = non_zero[idx + 1][1]
+            new_row |= (exponent + 1) << (CELL_BITS * target)
+            gain += 1 << (exponent + 1)
+            moves.append((col, target, True))
+            moves.append((next_col, target, True))
+            idx += 2
+        else:
+            new_row |= exponent << (CELL_BITS * target)
+            moves.append((col, target, False))
+            idx += 1
+        target += 1
+
+    # Rows with the same shape share one template, which keeps the table small.
+    template = tuple(moves)
+    return new_row, gain, _ROW_MOVE_TEMPLATES.setdefault(template, template)
+
+
+_ROW_MOVE_TEMPLATES: Dict[Tuple[Tuple[int, int, bool], ...], Tuple[Tuple[int, int, bool], ...]] = {}
+# Every possible 16-bit row mapped to (new_row, score_gain, ((start_col, end_col, merged), ...)).
+ROW_MOVE_LEFT = [_build_row_move_left(row) for row in range(1 << ROW_BITS)]
+
+
+def decode_board(state: int) -> List[List[int]]:
+    board: List[List[int]] = []
+    for r in range(GRID_SIZE):
+        row = []
+        for c in range(GRID_SIZE):
+            exponent = (state >> (CELL_BITS * (r * GRID_SIZE + c))) & CELL_MASK
+            row.append(1 << exponent if exponent else 0)
+        board.append(row)
+    return board
+
+
+def transpose(state: int) -> int:
+    a = (
+        (state & 0xF0F00F0FF0F00F0F)
+        | ((state & 0x0000F0F00000F0F0) << 12)
+        | ((state & 0x0F0F00000F0F0000) >> 12)
+    )
+    return (
+        (a & 0xFF00FF0000FF00FF)
+        | ((a & 0x00FF00FF00000000) >> 24)
+        | ((a & 0x00000000FF00FF00) << 24)
+    )
+
+
+def reverse_rows(state: int) -> int:
+    state = ((state & 0x0F0F0F0F0F0F0F0F) << 4) | ((state >> 4) & 0x0F0F0F0F0F0F0F0F)
+    return ((state & 0x00FF00FF00FF00FF) << 8) | ((state >> 8) & 0x00FF00FF00FF00FF)
+
+
+def nonzero_cells(state: int) -> int:
+    return (state | (state >> 1) | (state >> 2) | (state >> 3)) & NIBBLE_LOW_BITS
+
+
+def capped_cells(state: int) -> int:
+    return state & (state >> 1) & (state >> 2) & (state >> 3) & NIBBLE_LOW_BITS
+
+
+def has_winning_tile(state: int) -> bool:
+    # Alternate cells are spread into byte lanes so that adding 16 - WIN_EXPONENT carries into
+    # bit 4 of a lane exactly when that cell is >= WIN_EXPONENT, without spilling into its neighbour.
+    even_cells = state & BYTE_LOW_NIBBLES
+    odd_cells = (state >> CELL_BITS) & BYTE_LOW_NIBBLES
+    return ((even_cells + WIN_CARRY_BIAS) | (odd_cells + WIN_CARRY_BIAS)) & WIN_CARRY_BITS != 0
+
+
+def empty_cells(state: int) -> List[int]:
+    # Walks only the set bits of the empty-cell mask instead of all 16 cells.
+    empty = ~nonzero_cells(state) & NIBBLE_LOW_BITS
+    cells = []
+    while empty:
+        lowest = empty & -empty
+        cells.append(lowest.bit_length() >> 2)
+        empty ^= lowest
+    return cells
+
+
+def occupied_cells(state: int) -> Iterator[Tuple[int, int, int]]:
+    # Yields (row, col, value) for each tile in row-major order without decoding the whole board.
+    occupied = nonzero_cells(state)
+    while occupied:
+        lowest = occupied & -occupied
+        idx = lowest.bit_length() >> 2
+        r, c = divmod(idx, GRID_SIZE)
+        yield r, c, 1 << ((state >> (CELL_BITS * idx)) & CELL_MASK)
+        occupied ^= lowest
+
+
+# Indexed by direction code: (whether rows are reversed, whether the move runs along columns).
+DIRECTION_ORIENTATIONS: Tuple[Tuple[bool, bool], ...] = (
+    (False, False),
+    (True, False),
+    (False, True),
+    (True, True),
+)
+
+
+def step(state: int, direction: int) -> Tuple[int, int, bool]:
+    if not LEFT <= direction <= DOWN:
+        raise IndexError("direction code out of range")
+    mirrored, transposed = DIRECTION_ORIENTATIONS[direction]
+    lines = transpose(state) if transposed else state
+    if mirrored:
+        lines = reverse_rows(lines)
+    new_lines = 0
+    total_gain = 0
+    for line in range(GRID_SIZE):
+        shift = ROW_BITS * line
+        new_row, gain, _ = ROW_MOVE_LEFT[(lines >> shift) & ROW_MASK]
+        new_lines |= new_row << shift
+        total_gain += gain
+    if mirrored:
+        new_lines = reverse_rows(new_lines)
+    new_state = transpose(new_lines) if transposed else new_lines
+    return new_state, total_gain, new_state != state
+
+
+def can_move(state: int) -> bool:
+    if nonzero_cells(state) != NIBBLE_LOW_BITS:
+        return True
+    # A zero nibble in state ^ (state >> 4) marks two equal neighbours in a row, >> 16 in a column.
+    # Tiles at the CELL_MASK cap never merge (see _build_row_move_left), so those pairs do not count.
+    mergeable = ~capped_cells(state)
+    if ~nonzero_cells(state ^ (state >> CELL_BITS)) & HORIZONTAL_PAIRS & mergeable:
+        return True
+    return ~nonzero_cells(state ^ (state >> ROW_BITS)) & VERTICAL_PAIRS & mergeable != 0
 
 
-def transpose(board: List[List[int]]) -> List[List[int]]:
-    return [list(row) for row in zip(*board)]
+try:
+    # Optional compiled versions of step/can_move; see README for building it.
+    from game2048_core import can_move, step  # noqa: F811
+except ImportError:
+    pass
 
 
-@dataclass
-class TileMove:
+class TileMove(NamedTuple):
     start: Tuple[int, int]
     end: Tuple[int, int]
     value: int
     merged: bool = False
 
 
-@dataclass
-class MoveResult:
-    board: List[List[int]]
+class MoveResult(NamedTuple):
+    state: int
     score_gain: int
     moved: bool
     moves: List[TileMove]
@@ -105,14 +324,18 @@ class Game2048:
         self.best_score = state.get("best_score", 0)
         self.total_score = state.get("total_score", 0)
         self.score = 0
-        self.board: List[List[int]] = []
+        self.state = 0
         self.game_over = False
         self.won = False
         self.last_spawn: Optional[Tuple[int, int, int]] = None
         self.reset()
 
+    @property
+    def board(self) -> List[List[int]]:
+        return decode_board(self.state)
+
     def reset(self) -> None:
-        self.board = [[0 for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
+        self.state = 0
         self.score = 0
         self.game_over = False
         self.won = False
@@ -121,107 +344,71 @@ class Game2048:
         self._spawn_tile()
 
     def _spawn_tile(self) -> Optional[Tuple[int, int, int]]:
-        empty_cells = [(r, c) for r in range(GRID_SIZE) for c in range(GRID_SIZE) if self.board[r][c] == 0]
-        if not empty_cells:
+        cells = empty_cells(self.state)
+        if not cells:
             return None
-        r, c = random.choice(empty_cells)
-        value = 4 if random.random() < 0.1 else 2
-        self.board[r][c] = value
-        self.last_spawn = (r, c, value)
+        idx = random.choice(cells)
+        exponent = 2 if random.random() < 0.1 else 1
+        self.state |= exponent << (CELL_BITS * idx)
+        r, c = divmod(idx, GRID_SIZE)
+        self.last_spawn = (r, c, 1 << exponent)
         return self.last_spawn
 
-    def _move_left(self, board: List[List[int]]) -> MoveResult:
-        new_board: List[List[int]] = []
+    def _move_lines(self, state: int, mirrored: bool, transposed: bool) -> MoveResult:
+        # Columns are slid as rows of the transposed board and RIGHT/DOWN as reversed rows;
+        # tile moves are mapped back to board coordinates.
+        lines = transpose(state) if transposed else state
+        if mirrored:
+            lines = reverse_rows(lines)
+        last = GRID_SIZE - 1
+        new_lines = 0
         total_gain = 0
-        moved = False
         moves: List[TileMove] = []
 
-        for r, row in enumerate(board):
-            non_zero = [(value, r, c) for c, value in enumerate(row) if value != 0]
-            new_row = [0 for _ in range(GRID_SIZE)]
-            target = 0
-            idx = 0
-
-            while idx < len(non_zero):
-                value, sr, sc = non_zero[idx]
-                dest_col = target
-                if idx + 1 < len(non_zero) and non_zero[idx + 1][0] == value:
-                    next_value, nr, nc = non_zero[idx + 1]
-                    merged_value = value * 2
-                    new_row[dest_col] = merged_value
-                    total_gain += merged_value
-                    moves.append(TileMove(start=(sr, sc), end=(r, dest_col), value=value, merged=True))
-                    moves.append(TileMove(start=(nr, nc), end=(r, dest_col), value=next_value, merged=True))
-                    idx += 2
+        for line in range(GRID_SIZE):
+            shift = ROW_BITS * line
+            row = (lines >> shift) & ROW_MASK
+            new_row, gain, row_moves = ROW_MOVE_LEFT[row]
+            new_lines |= new_row << shift
+            total_gain += gain
+            for start, end, merged in row_moves:
+                value = 1 << ((row >> (CELL_BITS * start)) & CELL_MASK)
+                if mirrored:
+                    start, end = last - start, last - end
+                if transposed:
+                    moves.append(TileMove((start, line), (end, line), value, merged))
                 else:
-                    new_row[dest_col] = value
-                    moves.append(TileMove(start=(sr, sc), end=(r, dest_col), value=value, merged=False))
-                    idx += 1
-                target += 1
-
-            if new_row != row:
-                moved = True
-            new_board.append(new_row)
+                    moves.append(TileMove((line, start), (line, end), value, merged))
 
-        return MoveResult(board=new_board, score_gain=total_gain, moved=moved, moves=moves)
+        if mirrored:
+            new_lines = reverse_rows(new_lines)
+        new_state = transpose(new_lines) if transposed else new_lines
+        return MoveResult(state=new_state, score_gain=total_gain, moved=new_state != state, moves=moves)
 
-    def move(self, direction: str) -> Optional[MoveResult]:
-        if direction not in {"LEFT", "RIGHT", "UP", "DOWN"}:
+    def move(self, direction: int, collect_moves: bool = True) -> Optional[MoveResult]:
+        if not LEFT <= direction <= DOWN:
             return None
 
-        if direction == "LEFT":
-            result = self._move_left(self.board)
-        elif direction == "RIGHT":
-            flipped = [reverse(row) for row in self.board]
-            result = self._move_left(flipped)
-            result.board = [reverse(row) for row in result.board]
-            result.moves = [self._mirror_horizontal(move) for move in result.moves]
-        elif direction == "UP":
-            transposed = transpose(self.board)
-            result = self._move_left(transposed)
-            result.board = transpose(result.board)
-            result.moves = [self._transpose_move(move) for move in result.moves]
-        else:  # DOWN
-            transposed = transpose(self.board)
-            flipped = [reverse(row) for row in transposed]
-            result = self._move_left(flipped)
-            unflipped = [reverse(row) for row in result.board]
-            result.board = transpose(unflipped)
-            mirrored = [self._mirror_horizontal(move) for move in result.moves]
-            result.moves = [self._transpose_move(move) for move in mirrored]
-
+        if collect_moves:
+            result = self._move_lines(self.state, *DIRECTION_ORIENTATIONS[direction])
+        else:
+            new_state, gain, moved = step(self.state, direction)
+            result = MoveResult(state=new_state, score_gain=gain, moved=moved, moves=[])
         if not result.moved:
             return None
 
-        self.board = result.board
+        self.state = result.state
         self.score += result.score_gain
         self._apply_score_gain(result.score_gain)
 
-        if any(cell >= 2048 for row in self.board for cell in row):
+        # Only a merge can create a new 2048, and once won the flag sticks.
+        if not self.won and result.score_gain and has_winning_tile(self.state):
             self.won = True
 
-        result.spawn = self._spawn_tile()
+        spawn = self._spawn_tile()
         self.game_over = not self._can_move()
 
-        return result
-
-    @staticmethod
-    def _mirror_horizontal(move: TileMove) -> TileMove:
-        return TileMove(
-            start=(move.start[0], GRID_SIZE - 1 - move.start[1]),
-            end=(move.end[0], GRID_SIZE - 1 - move.end[1]),
-            value=move.value,
-            merged=move.merged,
-        )
-
-    @staticmethod
-    def _transpose_move(move: TileMove) -> TileMove:
-        return TileMove(
-            start=(move.start[1], move.start[0]),
-            end=(move.end[1], move.end[0]),
-            value=move.value,
-            merged=move.merged,
-        )
+        return result._replace(spawn=spawn)
 
     def _apply_score_gain(self, gain: int) -> None:
         if gain <= 0:
@@ -229,26 +416,13 @@ class Game2048:
         self.total_score += gain
         if self.score > self.best_score:
             self.best_score = self.score
-        save_score_state(self.best_score, self.total_score)
+        score_writer.submit(self.best_score, self.total_score)
 
     def current_total(self) -> int:
         return self.total_score
 
     def _can_move(self) -> bool:
-        if any(0 in row for row in self.board):
-            return True
-
-        for r in range(GRID_SIZE):
-            for c in range(GRID_SIZE - 1):
-                if self.board[r][c] == self.board[r][c + 1]:
-                    return True
-
-        for c in range(GRID_SIZE):
-            for r in range(GRID_SIZE - 1):
-                if self.board[r][c] == self.board[r + 1][c]:
-                    return True
-
-        return False
+        return can_move(self.state)
 
 
 class GameApp:
@@ -273,6 +447,27 @@ class GameApp:
         self.last_gain = 0
         self.last_gain_time = 0
         self.current_time = 0
+        # Screen regions redrawn since the last display update; the first frame covers the whole window.
+        self._dirty_rects: List[pygame.Rect] = [WINDOW_RECT]
+        self._actions = {"RESTART": self._restart_game, "QUIT": self._quit}
+        self._tile_fonts = tuple(self._font_for_tile(1 << (n - 1) if n else 0) for n in range(len(TILE_COLORS_TABLE)))
+        self._tile_text_cache: Dict[int, pygame.Surface] = {}
+        self._tile_surface_cache: Dict[int, pygame.Surface] = {}
+        for value in TILE_COLORS:
+            if value:
+                self._tile_surface(value)
+        self._title_surface = self.font_large.render("2048", True, TEXT_COLOR).convert_alpha()
+        self._score_label_surfaces = {
+            label: self.font_small.render(label, True, LIGHT_TEXT_COLOR).convert_alpha() for label in SCORE_LABELS
+        }
+        self._header_button_surfaces = [
+            (self.font_medium.render(label, True, TEXT_COLOR).convert_alpha(), action)
+            for label, action in HEADER_CONTROL_BUTTONS
+        ]
+        self._board_bg = self._build_board_background()
+        self._overlay_surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA).convert_alpha()
+        self._overlay_surface.fill((255, 255, 255, 200))
+        self._score_str_cache: Dict[str, Tuple[int, pygame.Surface]] = {}
 
     def run(self) -> None:
         while True:
@@ -280,14 +475,21 @@ class GameApp:
             self.current_time = pygame.time.get_ticks()
             self._handle_events()
             self._update_animations()
-            self._draw()
-            pygame.display.flip()
+            if self._dirty_rects:
+                self._draw()
+                pygame.display.update(self._dirty_rects)
+                self._dirty_rects.clear()
+
+    def _invalidate(self, rect: pygame.Rect) -> None:
+        if rect not in self._dirty_rects:
+            self._dirty_rects.append(rect)
 
     def _handle_events(self) -> None:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+                self._quit()
+            if event.type in EXPOSE_EVENTS:
+                self._invalidate(WINDOW_RECT)
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 if self.game.game_over or self.game.won:
                     self._handle_overlay_click(event.pos)
@@ -295,22 +497,16 @@ class GameApp:
                 if self._handle_header_click(event.pos):
                     continue
             if event.type == pygame.KEYDOWN:
-                if event.key in (pygame.K_ESCAPE, pygame.K_q):
-                    pygame.quit()
-                    sys.exit()
+                if event.key in QUIT_KEYS:
+                    self._quit()
                 if event.key == pygame.K_r:
                     self._restart_game()
                     return
                 if self.game.game_over:
                     continue
-                direction = {
-                    pygame.K_LEFT: "LEFT",
-                    pygame.K_RIGHT: "RIGHT",
-                    pygame.K_UP: "UP",
-                    pygame.K_DOWN: "DOWN",
-                }.get(event.key)
-                if direction:
-                    self._trigger_action(direction)
+                direction = KEY_TO_DIRECTION.get(event.key)
+                if direction is not None:
+                    self._trigger_move(direction)
 
     def _record_gain(self, gain: int) -> None:
         if gain <= 0:
@@ -324,6 +520,7 @@ class GameApp:
         self.spawn_animation = None
         self.pending_spawn = None
         self.overlay_buttons = {}
+        self._invalidate(WINDOW_RECT)
 
     def _handle_overlay_click(self, pos: Tuple[int, int]) -> None:
         replay_rect = self.overlay_buttons.get("replay")
@@ -331,8 +528,7 @@ class GameApp:
         if replay_rect and replay_rect.collidepoint(pos):
             self._restart_game()
         elif exit_rect and exit_rect.collidepoint(pos):
-            pygame.quit()
-            sys.exit()
+            self._quit()
 
     def _handle_header_click(self, pos: Tuple[int, int]) -> bool:
         for action, rect in self.header_buttons.items():
@@ -341,17 +537,24 @@ class GameApp:
                 return True
         return False
 
+    def _trigger_move(self, direction: int) -> None:
+        result = self.game.move(direction)
+        if result:
+            self._record_gain(result.score_gain)
+            self._start_move_animation(result)
+            if self.game.game_over or self.game.won:
+                self._invalidate(WINDOW_RECT)
+            else:
+                self._invalidate(HEADER_RECT)
+                self._invalidate(BOARD_RECT)
+
     def _trigger_action(self, action: str) -> None:
-        if action in {"UP", "DOWN", "LEFT", "RIGHT"}:
-            result = self.game.move(action)
-            if result:
-                self._record_gain(result.score_gain)
-                self._start_move_animation(result)
-        elif action == "RESTART":
-            self._restart_game()
-        elif action == "QUIT":
-            pygame.quit()
-            sys.exit()
+        self._actions[action]()
+
+    def _quit(self) -> None:
+        score_writer.flush()
+        pygame.quit()
+        sys.exit()
 
     def _draw(self) -> None:
         self.screen.fill(BACKGROUND_COLOR)
@@ -363,10 +566,9 @@ class GameApp:
             self.overlay_buttons = {}
 
     def _draw_header(self) -> None:
-        title_surface = self.font_large.render("2048", True, TEXT_COLOR)
-        title_rect = title_surface.get_rect()
+        title_rect = self._title_surface.get_rect()
         title_rect.topleft = (BOARD_MARGIN, 36)
-        self.screen.blit(title_surface, title_rect)
+        self.screen.blit(self._title_surface, title_rect)
 
         box_width = 152
         box_height = 68
@@ -379,37 +581,33 @@ class GameApp:
 
         self._draw_header_buttons(best_rect.bottom + 20)
 
+    def _build_board_background(self) -> pygame.Surface:
+        surface = pygame.Surface((BOARD_SIZE, BOARD_SIZE), pygame.SRCALPHA)
+        pygame.draw.rect(surface, BOARD_COLOR, (0, 0, BOARD_SIZE, BOARD_SIZE), border_radius=8)
+        for r in range(GRID_SIZE):
+            for c in range(GRID_SIZE):
+                x, y = self._cell_position(r, c)
+                empty_rect = pygame.Rect(x - BOARD_MARGIN, y - BOARD_TOP, TILE_SIZE, TILE_SIZE)
+                pygame.draw.rect(surface, TILE_COLORS_TABLE[0], empty_rect, border_radius=6)
+        return surface.convert_alpha()
+
     def _draw_board(self) -> None:
-        pygame.draw.rect(
-            self.screen,
-            BOARD_COLOR,
-            (BOARD_MARGIN, BOARD_TOP, BOARD_SIZE, BOARD_SIZE),
-            border_radius=8,
-        )
+        self.screen.blit(self._board_bg, (BOARD_MARGIN, BOARD_TOP))
         self._draw_static_tiles()
         if self.move_animation:
             self._draw_move_animation()
 
     def _draw_static_tiles(self) -> None:
         animated_targets = self._animated_targets()
-        for r in range(GRID_SIZE):
-            for c in range(GRID_SIZE):
+        for r, c, value in occupied_cells(self.game.state):
+            cell = (r, c)
+            if cell in animated_targets:
+                continue
+            if self.spawn_animation and self.spawn_animation["cell"] == cell:
+                self._draw_spawn_tile(cell, value)
+            else:
                 x, y = self._cell_position(r, c)
-                self._draw_tile(0, x, y, TILE_SIZE)
-
-        for r in range(GRID_SIZE):
-            for c in range(GRID_SIZE):
-                value = self.game.board[r][c]
-                if value == 0:
-                    continue
-                cell = (r, c)
-                if cell in animated_targets:
-                    continue
-                if self.spawn_animation and self.spawn_animation["cell"] == cell:
-                    self._draw_spawn_tile(cell, value)
-                else:
-                    x, y = self._cell_position(r, c)
-                    self._draw_tile(value, x, y, TILE_SIZE)
+                self._draw_tile(value, x, y, TILE_SIZE)
 
     def _draw_move_animation(self) -> None:
         if not self.move_animation:
@@ -439,17 +637,36 @@ class GameApp:
             self.spawn_animation = None
 
     def _draw_tile(self, value: int, x: float, y: float, size: float) -> None:
-        color = TILE_COLORS.get(value, (60, 58, 50))
-        rect = pygame.Rect(x, y, size, size)
-        pygame.draw.rect(self.screen, color, rect, border_radius=6)
-        if value:
+        surface = self._tile_surface(value)
+        if size != TILE_SIZE:
+            surface = pygame.transform.smoothscale(surface, (int(size), int(size)))
+        self.screen.blit(surface, (int(x), int(y)))
+
+    def _tile_surface(self, value: int) -> pygame.Surface:
+        surface = self._tile_surface_cache.get(value)
+        if surface is None:
+            surface = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+            rect = surface.get_rect()
+            pygame.draw.rect(surface, TILE_COLORS_TABLE[value.bit_length()], rect, border_radius=6)
+            if value:
+                text = self._tile_text(value)
+                surface.blit(text, text.get_rect(center=rect.center))
+            surface = surface.convert_alpha()
+            self._tile_surface_cache[value] = surface
+        return surface
+
+    def _tile_text(self, value: int) -> pygame.Surface:
+        text = self._tile_text_cache.get(value)
+        if text is None:
             text_color = LIGHT_TEXT_COLOR if value >= 8 else TEXT_COLOR
-            font = self._tile_font(value)
-            text = font.render(str(value), True, text_color)
-            text_rect = text.get_rect(center=rect.center)
-            self.screen.blit(text, text_rect)
+            text = self._tile_font(value).render(str(value), True, text_color).convert_alpha()
+            self._tile_text_cache[value] = text
+        return text
 
     def _tile_font(self, value: int) -> pygame.font.Font:
+        return self._tile_fonts[value.bit_length()]
+
+    def _font_for_tile(self, value: int) -> pygame.font.Font:
         if value < 100:
             return self.font_tile_big
         if value < 1000:
@@ -459,9 +676,7 @@ class GameApp:
         return self.font_tile_tiny
 
     def _draw_overlay(self) -> None:
-        overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((255, 255, 255, 200))
-        self.screen.blit(overlay, (0, 0))
+        self.screen.blit(self._overlay_surface, (0, 0))
 
         if self.game.won and not self.game.game_over:
             message = "You made 2048!"
@@ -514,6 +729,12 @@ class GameApp:
         return {(move.end[0], move.end[1]) for move in self.move_animation["moves"]}
 
     def _update_animations(self) -> None:
+        # Checked up front so the frame on which an animation finishes is still drawn.
+        if self.move_animation or self.spawn_animation or self.pending_spawn:
+            self._invalidate(BOARD_RECT)
+        if self.last_gain and not self._gain_active():
+            self._invalidate(HEADER_RECT)
+
         if self.move_animation:
             elapsed = self.current_time - self.move_animation["start_time"]
             if elapsed >= ANIMATION_DURATION_MS:
@@ -541,13 +762,22 @@ class GameApp:
     def _draw_score_box(self, rect: pygame.Rect, label: str, value: int, *, highlight: bool = False) -> None:
         box_color = (205, 190, 170) if highlight else BOARD_COLOR
         pygame.draw.rect(self.screen, box_color, rect, border_radius=8)
-        label_surface = self.font_small.render(label, True, LIGHT_TEXT_COLOR)
+        label_surface = self._score_label_surfaces[label]
         label_rect = label_surface.get_rect(center=(rect.centerx, rect.top + label_surface.get_height() / 2 + 6))
-        value_surface = self.font_medium.render(str(value), True, LIGHT_TEXT_COLOR)
+        value_surface = self._value_surface(label, value, self.font_medium, LIGHT_TEXT_COLOR)
         value_rect = value_surface.get_rect(center=(rect.centerx, rect.bottom - value_surface.get_height() / 2 - 6))
         self.screen.blit(label_surface, label_rect)
         self.screen.blit(value_surface, value_rect)
 
+    def _value_surface(
+        self, key: str, value: int, font: pygame.font.Font, color: Tuple[int, int, int], prefix: str = ""
+    ) -> pygame.Surface:
+        cached = self._score_str_cache.get(key)
+        if cached is None or cached[0] != value:
+            cached = (value, font.render(f"{prefix}{value}", True, color).convert_alpha())
+            self._score_str_cache[key] = cached
+        return cached[1]
+
     def _gain_active(self) -> bool:
         if self.last_gain <= 0:
             return False
@@ -559,7 +789,7 @@ class GameApp:
     def _draw_gain_indicator(self, anchor: pygame.Rect) -> None:
         if not self._gain_active():
             return
-        gain_surface = self.font_small.render(f"+{self.last_gain}", True, (197, 120, 30))
+        gain_surface = self._value_surface("GAIN", self.last_gain, self.font_small, (197, 120, 30), prefix="+")
         gain_rect = gain_surface.get_rect(midtop=(anchor.centerx, anchor.bottom + 6))
         self.screen.blit(gain_surface, gain_rect)
 
@@ -569,8 +799,7 @@ class GameApp:
         y = top_y
         row_height = 0
         max_width = WINDOW_WIDTH - BOARD_MARGIN
-        for label, action in HEADER_CONTROL_BUTTONS:
-            text_surface = self.font_medium.render(label, True, TEXT_COLOR)
+        for text_surface, action in self._header_button_surfaces:
             width = text_surface.get_width() + CONTROL_BUTTON_PADDING_X * 2
             height = max(CONTROL_BUTTON_HEIGHT, text_surface.get_height() + CONTROL_BUTTON_PADDING_Y * 2)
             if x + width > max_width:
@@ -579,8 +808,7 @@ class GameApp:
                 row_height = 0
             rect = pygame.Rect(x, y, width, height)
             row_height = max(row_height, height)
-            base_color = (226, 214, 198) if action in {"UP", "DOWN", "LEFT", "RIGHT"} else (196, 180, 160)
-            pygame.draw.rect(self.screen, base_color, rect, border_radius=10)
+            pygame.draw.rect(self.screen, HEADER_BUTTON_COLOR, rect, border_radius=10)
             text_rect = text_surface.get_rect(center=rect.center)
             self.screen.blit(text_surface, text_rect)
             self.header_buttons[action] = rect
@@ -590,8 +818,7 @@ class GameApp:
         self.overlay_buttons = {}
         total_width = BUTTON_WIDTH * 2 + BUTTON_GAP
         start_x = WINDOW_WIDTH / 2 - total_width / 2
-        labels = [("Replay", "replay"), ("Exit", "exit")]
-        for idx, (text, key) in enumerate(labels):
+        for idx, (text, key) in enumerate(OVERLAY_BUTTONS):
             rect = pygame.Rect(start_x + idx * (BUTTON_WIDTH + BUTTON_GAP), top_y, BUTTON_WIDTH, BUTTON_HEIGHT)
             color = BOARD_COLOR if key == "exit" else (146, 123, 99)
             text_color = LIGHT_TEXT_COLOR if key == "replay" else TEXT_COLOR